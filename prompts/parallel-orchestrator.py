@@ -5,11 +5,13 @@ Runs master planning + parallel slide agents for complete deck generation
 """
 
 import os
+import re
+import asyncio
 import json
 import time
+import functools
 from datetime import datetime
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
     from google import genai
@@ -19,24 +21,50 @@ except ImportError:
     print("Install with: pip install google-genai")
     exit(1)
 
+try:
+    import orjson  # Optional: faster metadata serialization
+except ImportError:
+    orjson = None
+
 # Configuration
 API_KEY = os.getenv("VITE_GEMINI_API_KEY")
 if not API_KEY:
     print("ERROR: VITE_GEMINI_API_KEY not found in environment")
     exit(1)
 
+# Shared Gemini client (reuses one connection pool across master + slide agents)
+_CLIENT = genai.Client(api_key=API_KEY)
+
 # Prompts directory
 PROMPTS_DIR = Path(__file__).parent
 
+# Master output patterns (compiled once, reused across calls)
+_SLIDE_BRIEF_RE = re.compile(r'(## SLIDE \d+ BRIEF:.*?)(?=## SLIDE \d+ BRIEF:|## NEXT STEPS|$)', re.DOTALL)
+_SLIDE_NUM_RE = re.compile(r'## SLIDE (\d+) BRIEF:')
+_TOKEN_RE = re.compile(r'\[(COMPANY_NAME|CONTENT_DESCRIPTION|AUDIENCE_TYPE|GOAL|NUMBER)\]')
+_HEADER_RE = re.compile(
+    r'^## (EXECUTIVE SUMMARY|BRAND RESEARCH|DECK ARCHITECTURE|DESIGN SYSTEM|SLIDE BRIEFS)\b.*$',
+    re.MULTILINE
+)
 
+
+@functools.lru_cache(maxsize=None)
 def load_prompt(filename):
-    """Load a prompt template"""
+    """Load a prompt template (cached: templates are static for a run)"""
     with open(PROMPTS_DIR / filename, 'r') as f:
         return f.read()
 
 
-def run_master_planning(company, content, audience, goal, slide_count):
-    """Phase 1: Run master planning agent"""
+async def run_master_planning(company, content, audience, goal, slide_count, on_brief=None):
+    """Phase 1: Run master planning agent
+
+    The response is streamed. If on_brief is given, it is called as
+    on_brief(brief, preamble) for each slide brief as soon as the brief is
+    complete (the next header has started), so slide agents can start while
+    the rest of the master output is still being generated. preamble is the
+    master output preceding the first brief (brand research, architecture,
+    design system).
+    """
     print("\n" + "="*80)
     print("PHASE 1: MASTER PLANNING AGENT")
     print("="*80 + "\n")
@@ -44,22 +72,23 @@ def run_master_planning(company, content, audience, goal, slide_count):
     # Load master prompt template
     master_template = load_prompt('parallel-master-prompt.md')
 
-    # Fill in the template
-    master_prompt = master_template.replace('[COMPANY_NAME]', company)
-    master_prompt = master_prompt.replace('[CONTENT_DESCRIPTION]', content)
-    master_prompt = master_prompt.replace('[AUDIENCE_TYPE]', audience)
-    master_prompt = master_prompt.replace('[GOAL]', goal)
-    master_prompt = master_prompt.replace('[NUMBER]', str(slide_count))
+    # Fill in the template (single pass over all placeholder tokens)
+    values = {
+        'COMPANY_NAME': company,
+        'CONTENT_DESCRIPTION': content,
+        'AUDIENCE_TYPE': audience,
+        'GOAL': goal,
+        'NUMBER': str(slide_count)
+    }
+    master_prompt = _TOKEN_RE.sub(lambda m: values[m.group(1)], master_template)
 
     print("Running master planning agent...")
     print(f"- Company: {company}")
     print(f"- Slides: {slide_count}")
 
-    client = genai.Client(api_key=API_KEY)
-
     start_time = time.time()
 
-    response = client.models.generate_content(
+    stream = await _CLIENT.aio.models.generate_content_stream(
         model="gemini-3-pro-preview",
         contents=master_prompt,
         config=types.GenerateContentConfig(
@@ -70,117 +99,138 @@ def run_master_planning(company, content, audience, goal, slide_count):
         )
     )
 
-    elapsed = time.time() - start_time
-
-    # Extract output
+    # Extract output as it streams
     thoughts = []
     output = []
-
-    for part in response.candidates[0].content.parts:
-        if part.thought:
-            thoughts.append(part.text)
+    pending = ''  # Output not yet handed off as a complete brief
+    scan_from = 0  # Offset in pending where the next brief search starts
+    preamble = None
+
+    def emit_briefs(final=False):
+        nonlocal pending, preamble, scan_from
+        consumed = 0
+        for match in _SLIDE_BRIEF_RE.finditer(pending, scan_from):
+            # A brief is complete once the next "## " header has started
+            if not final and not pending.startswith('## ', match.end()):
+                # Resume at this brief's header once more output arrives
+                scan_from = match.start()
+                break
+            if preamble is None:
+                preamble = pending[:match.start()]
+            brief = _make_brief(match.group(1))
+            if brief:
+                on_brief(brief, preamble)
+            consumed = match.end()
         else:
-            output.append(part.text)
+            # Only a header split across chunks can still start a match
+            scan_from = max(consumed, len(pending) - len("## SLIDE 999 BRIEF:"))
+        pending = pending[consumed:]
+        scan_from -= consumed
+
+    async for chunk in stream:
+        if not chunk.candidates or not chunk.candidates[0].content:
+            continue
+        new_output = False
+        for part in chunk.candidates[0].content.parts or []:
+            if not part.text:
+                continue
+            if part.thought:
+                thoughts.append(part.text)
+            else:
+                output.append(part.text)
+                if on_brief:
+                    pending += part.text
+                    new_output = True
+        if new_output:
+            emit_briefs()
 
-    master_output = '\n\n'.join(output)
+    if on_brief:
+        emit_briefs(final=True)
+
+    elapsed = time.time() - start_time
+
+    master_output = ''.join(output)
 
     print(f"\n✓ Master planning complete in {elapsed:.2f}s")
     print(f"  Output length: {len(master_output)} characters")
 
     return {
         'output': master_output,
-        'thoughts': '\n\n'.join(thoughts) if thoughts else None,
+        'thoughts': ''.join(thoughts) if thoughts else None,
         'elapsed_time': elapsed
     }
 
 
-def parse_slide_briefs(master_output):
-    """Extract individual slide briefs from master output"""
-    print("\n" + "="*80)
-    print("EXTRACTING SLIDE BRIEFS")
-    print("="*80 + "\n")
-
-    # Find all slide briefs (look for "## SLIDE X BRIEF:")
-    import re
-
-    # Split by slide brief headers
-    slide_pattern = r'(## SLIDE \d+ BRIEF:.*?)(?=## SLIDE \d+ BRIEF:|## NEXT STEPS|$)'
-    matches = re.findall(slide_pattern, master_output, re.DOTALL)
-
-    briefs = []
-    for match in matches:
-        # Extract slide number
-        slide_num_match = re.search(r'## SLIDE (\d+) BRIEF:', match)
-        if slide_num_match:
-            slide_num = int(slide_num_match.group(1))
-            briefs.append({
-                'slide_number': slide_num,
-                'brief': match.strip()
-            })
-
-    print(f"✓ Extracted {len(briefs)} slide briefs")
-    for brief in briefs:
-        print(f"  - Slide {brief['slide_number']}")
+def _make_brief(text):
+    """Build a slide brief dict from a matched "## SLIDE X BRIEF:" block"""
+    slide_num_match = _SLIDE_NUM_RE.search(text)
+    if not slide_num_match:
+        return None
+    return {
+        'slide_number': int(slide_num_match.group(1)),
+        'brief': text.strip()
+    }
 
-    return briefs
 
+def _parse_master_sections(master_output):
+    """Extract the top-level sections from master output in a single pass
 
-def extract_brand_and_design_system(master_output):
-    """Extract brand guidelines and design system from master output"""
-    # Find the sections
-    import re
+    Each section runs from its header to the next known header (or end of
+    output); the first occurrence of a header wins.
+    """
+    headers = list(_HEADER_RE.finditer(master_output))
+    found = {}
+    for i, match in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(master_output)
+        found.setdefault(match.group(1), master_output[match.end():end].strip())
 
-    # Extract BRAND RESEARCH section
-    brand_match = re.search(r'## BRAND RESEARCH(.*?)(?=## DECK ARCHITECTURE|$)', master_output, re.DOTALL)
-    brand_section = brand_match.group(1).strip() if brand_match else ""
+    return {
+        'exec_summary': found.get('EXECUTIVE SUMMARY', ""),
+        'brand_research': found.get('BRAND RESEARCH', ""),
+        'architecture': found.get('DECK ARCHITECTURE', ""),
+        'design_system': found.get('DESIGN SYSTEM', "")
+    }
 
-    # Extract DESIGN SYSTEM section
-    design_match = re.search(r'## DESIGN SYSTEM(.*?)(?=## SLIDE BRIEFS|$)', master_output, re.DOTALL)
-    design_section = design_match.group(1).strip() if design_match else ""
 
+def extract_brand_and_design_system(sections):
+    """Format brand guidelines and design system from parsed master sections"""
     combined = f"""## BRAND GUIDELINES
 
-{brand_section}
+{sections['brand_research']}
 
 ---
 
 ## DESIGN SYSTEM
 
-{design_section}
+{sections['design_system']}
 """
 
     return combined
 
 
-def run_slide_agent(slide_number, slide_brief, brand_and_design):
-    """Phase 2: Run a single slide agent"""
-    # Load slide agent template
-    slide_template = load_prompt('parallel-slide-agent-prompt.md')
-
-    # Build the complete prompt
-    slide_prompt = f"""# SLIDE SPECIFICATION TASK
-
-You are generating the specification for SLIDE {slide_number}.
+def build_slide_prompt_parts(brand_and_design):
+    """Precompute the parts of the slide agent prompt shared by every slide
 
----
-
-{brand_and_design}
-
----
-
-{slide_brief}
-
----
+    Returns (head, middle, tail); a slide's prompt is
+    head + slide number + middle + slide brief + tail.
+    """
+    slide_template = load_prompt('parallel-slide-agent-prompt.md')
+    head = "# SLIDE SPECIFICATION TASK\n\nYou are generating the specification for SLIDE "
+    middle = f".\n\n---\n\n{brand_and_design}\n\n---\n\n"
+    tail = f"\n\n---\n\n{slide_template}\n"
+    return head, middle, tail
 
-{slide_template}
-"""
 
-    client = genai.Client(api_key=API_KEY)
+async def run_slide_agent(slide_number, slide_brief, prompt_parts):
+    """Phase 2: Run a single slide agent (async, so many can be in flight at once)"""
+    # Build the complete prompt around the shared parts
+    head, middle, tail = prompt_parts
+    slide_prompt = ''.join((head, str(slide_number), middle, slide_brief, tail))
 
     start_time = time.time()
 
     try:
-        response = client.models.generate_content(
+        response = await _CLIENT.aio.models.generate_content(
             model="gemini-3-pro-preview",
             contents=slide_prompt,
             config=types.GenerateContentConfig(
@@ -219,125 +269,133 @@ You are generating the specification for SLIDE {slide_number}.
         }
 
 
-def run_parallel_slide_agents(slide_briefs, brand_and_design, max_workers=5):
-    """Phase 2: Run all slide agents in parallel"""
-    print("\n" + "="*80)
-    print("PHASE 2: PARALLEL SLIDE AGENTS")
-    print("="*80 + "\n")
-
-    print(f"Spawning {len(slide_briefs)} parallel agents...")
-    print(f"Max concurrent workers: {max_workers}\n")
+async def _run_slide_bounded(brief, prompt_parts, semaphore):
+    """Run one slide agent under the concurrency limit and report when it completes"""
+    async with semaphore:
+        result = await run_slide_agent(brief['slide_number'], brief['brief'], prompt_parts)
+    if result['success']:
+        print(f"✓ Slide {brief['slide_number']} complete ({result['elapsed_time']:.2f}s)")
+    else:
+        print(f"✗ Slide {brief['slide_number']} failed: {result.get('error', 'Unknown error')}")
+    return result
 
-    results = []
-    start_time = time.time()
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_slide = {
-            executor.submit(
-                run_slide_agent,
-                brief['slide_number'],
-                brief['brief'],
-                brand_and_design
-            ): brief['slide_number']
-            for brief in slide_briefs
-        }
+async def _collect_slide_results(slide_briefs, tasks):
+    """Wait for all slide agent tasks, turning unexpected exceptions into failed results"""
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Process as they complete
-        for future in as_completed(future_to_slide):
-            slide_num = future_to_slide[future]
-            try:
-                result = future.result()
-                if result['success']:
-                    print(f"✓ Slide {slide_num} complete ({result['elapsed_time']:.2f}s)")
-                else:
-                    print(f"✗ Slide {slide_num} failed: {result.get('error', 'Unknown error')}")
-                results.append(result)
-            except Exception as e:
-                print(f"✗ Slide {slide_num} exception: {str(e)}")
-                results.append({
-                    'slide_number': slide_num,
-                    'success': False,
-                    'error': str(e)
-                })
-
-    total_time = time.time() - start_time
+    results = []
+    for brief, outcome in zip(slide_briefs, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"✗ Slide {brief['slide_number']} exception: {str(outcome)}")
+            outcome = {
+                'slide_number': brief['slide_number'],
+                'success': False,
+                'error': str(outcome)
+            }
+        results.append(outcome)
 
     # Sort by slide number
     results.sort(key=lambda x: x['slide_number'])
 
-    print(f"\n✓ All slide agents complete in {total_time:.2f}s")
-    print(f"  Success: {sum(1 for r in results if r['success'])}/{len(results)}")
-
     return results
 
 
-def assemble_final_document(master_output, slide_results):
-    """Assemble the final complete specification document"""
-    print("\n" + "="*80)
-    print("ASSEMBLING FINAL DOCUMENT")
-    print("="*80 + "\n")
+async def run_pipelined_generation(company, content, audience, goal, slide_count, max_concurrency=10):
+    """Phase 1 + 2 as a pipeline: each slide agent starts as soon as its brief
+    has streamed out of the master planning agent
+
+    Returns (master_result, sections, slide_results), where sections are the
+    parsed master sections for assemble_final_document.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    slide_briefs = []
+    tasks = []
+    sections = None
+    prompt_parts = None
+
+    def on_brief(brief, preamble):
+        nonlocal sections, prompt_parts
+        if sections is None:
+            # All top-level sections precede the first brief; parse them once
+            sections = _parse_master_sections(preamble)
+            prompt_parts = build_slide_prompt_parts(extract_brand_and_design_system(sections))
+            print("\n" + "="*80)
+            print("PHASE 2: PARALLEL SLIDE AGENTS (started while master planning streams)")
+            print("="*80 + "\n")
+            print(f"Max concurrent requests: {max_concurrency}\n")
+        print(f"→ Slide {brief['slide_number']} brief ready, starting agent")
+        slide_briefs.append(brief)
+        tasks.append(asyncio.ensure_future(_run_slide_bounded(brief, prompt_parts, semaphore)))
+
+    master_result = await run_master_planning(
+        company, content, audience, goal, slide_count, on_brief=on_brief
+    )
 
-    import re
+    slide_results = await _collect_slide_results(slide_briefs, tasks)
 
-    # Extract sections from master output
-    exec_summary_match = re.search(r'## EXECUTIVE SUMMARY(.*?)(?=##|\Z)', master_output, re.DOTALL)
-    exec_summary = exec_summary_match.group(1).strip() if exec_summary_match else ""
+    if sections is None:
+        sections = _parse_master_sections(master_result['output'])
 
-    brand_match = re.search(r'## BRAND RESEARCH(.*?)(?=## DECK ARCHITECTURE|\Z)', master_output, re.DOTALL)
-    brand_research = brand_match.group(1).strip() if brand_match else ""
+    if slide_results:
+        print(f"\n✓ All slide agents complete")
+        print(f"  Success: {sum(1 for r in slide_results if r['success'])}/{len(slide_results)}")
 
-    arch_match = re.search(r'## DECK ARCHITECTURE(.*?)(?=## DESIGN SYSTEM|\Z)', master_output, re.DOTALL)
-    architecture = arch_match.group(1).strip() if arch_match else ""
+    return master_result, sections, slide_results
 
-    design_match = re.search(r'## DESIGN SYSTEM(.*?)(?=## SLIDE BRIEFS|\Z)', master_output, re.DOTALL)
-    design_system = design_match.group(1).strip() if design_match else ""
 
-    # Build final document
-    final_doc = f"""# COMPLETE SLIDE DECK SPECIFICATION
+def assemble_final_document(sections, slide_results):
+    """Assemble the final complete specification document from parsed master sections"""
+    print("\n" + "="*80)
+    print("ASSEMBLING FINAL DOCUMENT")
+    print("="*80 + "\n")
+
+    # Build final document as a list of parts, joined once at the end
+    parts = [f"""# COMPLETE SLIDE DECK SPECIFICATION
 ## Generated with Parallel Agent Architecture
 
 ---
 
 ## EXECUTIVE SUMMARY
 
-{exec_summary}
+{sections['exec_summary']}
 
 ---
 
 ## BRAND RESEARCH
 
-{brand_research}
+{sections['brand_research']}
 
 ---
 
 ## DECK ARCHITECTURE
 
-{architecture}
+{sections['architecture']}
 
 ---
 
 ## DESIGN SYSTEM
 
-{design_system}
+{sections['design_system']}
 
 ---
 
 ## DETAILED SLIDE SPECIFICATIONS
 
-"""
+"""]
 
-    # Add all slide specifications
+    # Add all slide specifications (slide outputs are referenced, not copied,
+    # so the final join is the only copy of their text)
     for result in slide_results:
         if result['success']:
-            final_doc += f"\n{result['output']}\n\n"
+            parts += ("\n", result['output'], "\n\n")
         else:
-            final_doc += f"\n### SLIDE {result['slide_number']}: ERROR\n\n"
-            final_doc += f"**Error:** {result.get('error', 'Failed to generate')}\n\n"
-            final_doc += "---\n\n"
+            parts.append(f"\n### SLIDE {result['slide_number']}: ERROR\n\n")
+            parts.append(f"**Error:** {result.get('error', 'Failed to generate')}\n\n")
+            parts.append("---\n\n")
 
     # Add production notes
-    final_doc += """
+    parts.append("""
 ---
 
 ## PRODUCTION NOTES
@@ -364,7 +422,9 @@ This specification was generated using a parallel agent architecture:
 ---
 
 **Generated with Gemini 2.5 Pro Parallel Architecture**
-"""
+""")
+
+    final_doc = ''.join(parts)
 
     print(f"✓ Final document assembled")
     print(f"  Total length: {len(final_doc)} characters")
@@ -372,8 +432,25 @@ This specification was generated using a parallel agent architecture:
     return final_doc
 
 
-def save_results(company, master_result, slide_results, final_document):
-    """Save all results to files"""
+def _slide_time_stats(slide_results):
+    """Sum and max of slide agent times in one pass, plus the implied parallel speedup"""
+    total = 0.0
+    longest = 0.0
+    for r in slide_results:
+        elapsed = r['elapsed_time']
+        total += elapsed
+        if elapsed > longest:
+            longest = elapsed
+    speedup = total / longest if longest else 0.0
+    return total, longest, speedup
+
+
+def save_results(company, master_result, slide_results, final_document, generation_time):
+    """Save all results to files
+
+    generation_time is the wall-clock time of the pipelined run. Slide agents
+    overlap master planning, so it is not master time plus the slowest slide.
+    """
     print("\n" + "="*80)
     print("SAVING RESULTS")
     print("="*80 + "\n")
@@ -386,29 +463,29 @@ def save_results(company, master_result, slide_results, final_document):
 
     # Save master output
     master_file = results_dir / f"{company_safe}_master_{timestamp}.md"
-    with open(master_file, 'w') as f:
-        f.write(f"# Master Planning Output\n\n")
-        f.write(f"**Company:** {company}\n")
-        f.write(f"**Timestamp:** {timestamp}\n")
-        f.write(f"**Generation Time:** {master_result['elapsed_time']:.2f}s\n\n")
-        f.write("---\n\n")
-        if master_result['thoughts']:
-            f.write("## THINKING OUTPUT\n\n")
-            f.write(master_result['thoughts'])
-            f.write("\n\n---\n\n")
-        f.write("## MASTER OUTPUT\n\n")
-        f.write(master_result['output'])
+    master_parts = [
+        "# Master Planning Output\n\n",
+        f"**Company:** {company}\n",
+        f"**Timestamp:** {timestamp}\n",
+        f"**Generation Time:** {master_result['elapsed_time']:.2f}s\n\n",
+        "---\n\n"
+    ]
+    if master_result['thoughts']:
+        master_parts += ["## THINKING OUTPUT\n\n", master_result['thoughts'], "\n\n---\n\n"]
+    master_parts += ["## MASTER OUTPUT\n\n", master_result['output']]
+
+    master_file.write_text(''.join(master_parts), encoding='utf-8')
 
     print(f"✓ Master output: {master_file}")
 
     # Save final complete document
     final_file = results_dir / f"{company_safe}_complete_{timestamp}.md"
-    with open(final_file, 'w') as f:
-        f.write(final_document)
+    final_file.write_text(final_document, encoding='utf-8')
 
     print(f"✓ Final document: {final_file}")
 
     # Save metadata
+    _, _, speedup = _slide_time_stats(slide_results)
     metadata = {
         'company': company,
         'timestamp': timestamp,
@@ -424,13 +501,15 @@ def save_results(company, master_result, slide_results, final_document):
             }
             for r in slide_results
         ],
-        'total_generation_time': master_result['elapsed_time'] + max(r['elapsed_time'] for r in slide_results),
-        'parallel_speedup': f"{sum(r['elapsed_time'] for r in slide_results) / max(r['elapsed_time'] for r in slide_results):.2f}x"
+        'total_generation_time': generation_time,
+        'parallel_speedup': f"{speedup:.2f}x"
     }
 
     metadata_file = results_dir / f"{company_safe}_metadata_{timestamp}.json"
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    if orjson:
+        metadata_file.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        metadata_file.write_text(json.dumps(metadata, indent=2, default=str), encoding='utf-8')
 
     print(f"✓ Metadata: {metadata_file}")
 
@@ -476,31 +555,32 @@ The presentation should cover:
 
     total_start = time.time()
 
-    # Phase 1: Master Planning
-    master_result = run_master_planning(company, content, audience, goal, slide_count)
+    # Warm the template cache before the fan-out starts
+    load_prompt('parallel-slide-agent-prompt.md')
 
-    # Extract slide briefs
-    slide_briefs = parse_slide_briefs(master_result['output'])
+    # Phase 1 + 2: Master planning streamed into parallel slide generation
+    generation_start = time.time()
+    master_result, sections, slide_results = asyncio.run(
+        run_pipelined_generation(company, content, audience, goal, slide_count, max_concurrency=10)
+    )
+    generation_time = time.time() - generation_start
 
-    if not slide_briefs:
+    if not slide_results:
         print("\n✗ ERROR: No slide briefs found in master output")
         print("Master output may not have followed expected format")
         return
 
-    # Extract brand and design system
-    brand_and_design = extract_brand_and_design_system(master_result['output'])
-
-    # Phase 2: Parallel Slide Generation
-    slide_results = run_parallel_slide_agents(slide_briefs, brand_and_design, max_workers=5)
-
     # Assemble final document
-    final_document = assemble_final_document(master_result['output'], slide_results)
+    final_document = assemble_final_document(sections, slide_results)
 
     # Save results
-    files = save_results(company, master_result, slide_results, final_document)
+    files = save_results(company, master_result, slide_results, final_document, generation_time)
 
     # Summary
     total_time = time.time() - total_start
+    _, _, speedup = _slide_time_stats(slide_results)
+    # Slide agents start during master planning; count only what ran after it
+    after_master = max(0.0, generation_time - master_result['elapsed_time'])
 
     print("\n" + "="*80)
     print("GENERATION COMPLETE")
@@ -508,8 +588,8 @@ The presentation should cover:
 
     print(f"Total time: {total_time:.2f}s")
     print(f"Master planning: {master_result['elapsed_time']:.2f}s")
-    print(f"Parallel generation: {max(r['elapsed_time'] for r in slide_results):.2f}s")
-    print(f"Speedup vs sequential: {sum(r['elapsed_time'] for r in slide_results) / max(r['elapsed_time'] for r in slide_results):.2f}x\n")
+    print(f"Parallel generation after master planning: {after_master:.2f}s")
+    print(f"Speedup vs sequential: {speedup:.2f}x\n")
 
     print(f"Results saved to:")
     print(f"  {files['final_file']}\n")
@@ -4,15 +4,21 @@ Gemini 2.5 Pro Slide Deck Design Prompt - Test Runner
 Runs test cases and evaluates output quality against rubric.
 """
 
+import io
 import os
+import argparse
+import re
 import json
+import asyncio
 import time
+import functools
 from datetime import datetime
 from pathlib import Path
 
 try:
+    import httpx
     from google import genai
-    from google.genai import types
+    from google.genai import errors, types
 except ImportError:
     print("ERROR: google-genai package not installed.")
     print("Install with: pip install google-genai")
@@ -25,6 +31,29 @@ if not API_KEY:
     print("Make sure .env file is loaded or export the variable")
     exit(1)
 
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Shared Gemini client, created on first use and reused by every test"""
+    print("Initializing Gemini 2.5 Pro client...")
+    return genai.Client(api_key=API_KEY)
+
+
+# Retry policy for transient API failures (rate limits, overload, timeouts)
+_MAX_ATTEMPTS = 4
+_RETRYABLE_STATUS = {429, 500, 503, 504}
+
+# A whole-line, non-negative integer score (at most 3 digits, so int() never fails)
+_SCORE_RE = re.compile(r"^\s*(\d{1,3})\s*$")
+
+# Result JSON key -> usage_metadata field
+_USAGE_FIELDS = {
+    "prompt_tokens": "prompt_token_count",
+    "candidates_tokens": "candidates_token_count",
+    "total_tokens": "total_token_count",
+    "thoughts_tokens": "thoughts_token_count"
+}
+
 # Test cases
 TEST_CASES = {
     "atlassian": {
@@ -83,35 +112,34 @@ The presentation should cover:
 }
 
 
+@functools.lru_cache(maxsize=1)
 def load_prompt_template():
-    """Load the enhanced prompt template"""
+    """Load the enhanced prompt template (cached: static for a run)"""
     prompt_file = Path(__file__).parent / "gemini-slide-designer-prompt.md"
     with open(prompt_file, 'r') as f:
         return f.read()
 
 
-def build_test_prompt(test_case_name):
-    """Build complete prompt for a test case"""
-    template = load_prompt_template()
-    test = TEST_CASES[test_case_name]
+# Shared by every test case; read once at import
+_PROMPT_TEMPLATE = load_prompt_template()
 
-    # Find the "NOW EXECUTE" section and replace with actual test case
-    filled_prompt = template + f"""
+# Test case block appended to the template (the "NOW EXECUTE" section)
+_SUFFIX = """
 
 ---
 
-## NOW EXECUTING TEST CASE: {test_case_name.upper()}
+## NOW EXECUTING TEST CASE: {name}
 
-**Company Name:** {test['company']}
+**Company Name:** {company}
 
 **Content/Narrative:**
-{test['content']}
+{content}
 
-**Target Audience:** {test['audience']}
+**Target Audience:** {audience}
 
-**Presentation Goal:** {test['goal']}
+**Presentation Goal:** {goal}
 
-**Desired Slide Count:** {test['slides']}
+**Desired Slide Count:** {slides}
 
 ---
 
@@ -126,33 +154,100 @@ Remember to:
 Your output should be so detailed that a graphic designer can execute the entire deck without asking a single clarifying question.
 """
 
-    return filled_prompt
+# Complete prompts are fully determined by the test case, so build them once
+_CASE_SUFFIXES = {
+    name: _SUFFIX.format(name=name.upper(), **test)
+    for name, test in TEST_CASES.items()
+}
+_FILLED_PROMPTS = {
+    name: _PROMPT_TEMPLATE + suffix
+    for name, suffix in _CASE_SUFFIXES.items()
+}
 
 
-def run_test(test_case_name, thinking_budget=16384, save_thoughts=True):
-    """Run a single test case"""
-    print(f"\n{'='*80}")
-    print(f"Running Test Case: {test_case_name.upper()}")
-    print(f"{'='*80}\n")
+def build_test_prompt(test_case_name):
+    """Build complete prompt for a test case"""
+    return _FILLED_PROMPTS[test_case_name]
+
+
+def _is_retryable(error):
+    """Whether a failed request is worth retrying"""
+    if isinstance(error, errors.APIError):
+        return error.code in _RETRYABLE_STATUS
+    return isinstance(error, httpx.TimeoutException)
+
+
+async def _open_stream(client, tag, **request):
+    """Stream a generation, retrying transient failures until the first chunk arrives
+
+    The SDK sends the request lazily on first iteration, so opening the stream
+    and pulling its first chunk is the retried step. Waits 4s, 8s, 16s between
+    attempts (capped at 60s) and logs each retry. Failures after the stream has
+    started are not retried; the partial output is kept on disk.
+    """
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        try:
+            stream = await client.aio.models.generate_content_stream(**request)
+            first = await anext(stream, None)
+            break
+        except Exception as e:
+            if attempt == _MAX_ATTEMPTS or not _is_retryable(e):
+                raise
+            delay = min(60, 4 * 2 ** (attempt - 1))
+            print(f"{tag} Transient error ({str(e)}), retrying in {delay}s "
+                  f"(attempt {attempt + 1}/{_MAX_ATTEMPTS})...")
+            await asyncio.sleep(delay)
+
+    if first is None:
+        return
+    yield first
+    async for chunk in stream:
+        yield chunk
+
+
+async def run_test_async(test_case_name, thinking_budget=16384, save_thoughts=True, client=None,
+                         cached_content=None):
+    """Run a single test case (no interactive input, so cases can run concurrently)
+
+    If cached_content names a context cache holding the prompt template, only
+    the test case block is sent with the request.
+    """
+    # Prefix status lines so output from concurrent runs stays readable
+    tag = f"[{test_case_name}]"
+    print(f"\n{tag} Running Test Case: {test_case_name.upper()}")
 
     # Build prompt
-    print("Building prompt...")
-    prompt = build_test_prompt(test_case_name)
+    print(f"{tag} Building prompt...")
+    if cached_content:
+        prompt = _CASE_SUFFIXES[test_case_name]
+    else:
+        prompt = build_test_prompt(test_case_name)
 
-    # Initialize client
-    print("Initializing Gemini 2.5 Pro client...")
-    client = genai.Client(api_key=API_KEY)
+    client = client or get_client()
 
     # Run inference
-    print(f"Running inference with thinking_budget={thinking_budget}...")
-    print("This may take 1-3 minutes for complex design specs...")
+    print(f"{tag} Running inference with thinking_budget={thinking_budget}...")
+    print(f"{tag} This may take 1-3 minutes for complex design specs...")
+
+    # Results are streamed to the .md file as they arrive, so partial output
+    # survives a mid-run failure
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_dir = Path(__file__).parent / "test-results"
+    results_dir.mkdir(exist_ok=True)
+
+    result_file = results_dir / f"{test_case_name}_{timestamp}.json"
+    md_file = results_dir / f"{test_case_name}_{timestamp}.md"
+
     start_time = time.time()
 
     try:
-        response = client.models.generate_content(
+        response = _open_stream(
+            client,
+            tag,
             model="gemini-3-pro-preview",
             contents=prompt,
             config=types.GenerateContentConfig(
+                cached_content=cached_content,
                 thinking_config=types.ThinkingConfig(
                     thinking_budget=thinking_budget,
                     include_thoughts=save_thoughts
@@ -160,82 +255,152 @@ def run_test(test_case_name, thinking_budget=16384, save_thoughts=True):
             )
         )
 
-        elapsed_time = time.time() - start_time
-        print(f"\nGeneration completed in {elapsed_time:.2f} seconds")
-
-        # Extract thoughts and answer
-        thoughts = []
-        answer = []
-
-        for part in response.candidates[0].content.parts:
-            if part.thought:
-                thoughts.append(part.text)
-            else:
-                answer.append(part.text)
+        # Extract thoughts and answer as they stream
+        thoughts = io.StringIO()
+        answer = io.StringIO()
+        usage_metadata = None
+        first_token_time = None
+        section = None
+
+        # Binary mode with a large buffer: text is encoded here once per part,
+        # skipping the TextIOWrapper layer
+        with open(md_file, 'wb', buffering=1 << 20) as f:
+            f.write((
+                f"# Test Case: {test_case_name}\n\n"
+                f"**Timestamp:** {timestamp}\n"
+                f"**Thinking Budget:** {thinking_budget}\n\n"
+            ).encode('utf-8'))
+
+            if not save_thoughts:
+                # include_thoughts=False: the API sends no thought parts, so the
+                # answer starts right after the header and the loop below needs
+                # no per-part save_thoughts check
+                f.write(b"## SPECIFICATION OUTPUT\n\n")
+                section = 'answer'
+
+            async for chunk in response:
+                # Usage totals are reported on the stream's final chunk
+                usage_metadata = chunk.usage_metadata or usage_metadata
+                if not chunk.candidates or not chunk.candidates[0].content:
+                    continue
+
+                for part in chunk.candidates[0].content.parts or []:
+                    if not part.text:
+                        continue
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                        print(f"{tag} First token after {first_token_time:.2f} seconds")
+
+                    if part.thought:
+                        if section != 'thoughts':
+                            f.write((b"\n\n" if section else b"") + b"---\n\n## THINKING OUTPUT\n\n")
+                            section = 'thoughts'
+                        thoughts.write(part.text)
+                    else:
+                        if section != 'answer':
+                            f.write((b"\n\n---\n\n" if section else b"") + b"## SPECIFICATION OUTPUT\n\n")
+                            section = 'answer'
+                        answer.write(part.text)
+                    f.write(part.text.encode('utf-8'))
+
+                f.flush()
+
+            elapsed_time = time.time() - start_time
+            f.write(f"\n\n---\n\n**Generation Time:** {elapsed_time:.2f}s\n".encode('utf-8'))
+
+        print(f"\n{tag} Generation completed in {elapsed_time:.2f} seconds")
+
+        # Read the buffers once; reused for the JSON payload and the summary
+        thoughts_text = thoughts.getvalue() or None
+        answer_text = answer.getvalue()
 
         # Save results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_dir = Path(__file__).parent / "test-results"
-        results_dir.mkdir(exist_ok=True)
-
-        result_file = results_dir / f"{test_case_name}_{timestamp}.json"
-
+        usage = vars(usage_metadata) if usage_metadata is not None else {}
         result_data = {
             "test_case": test_case_name,
             "timestamp": timestamp,
             "thinking_budget": thinking_budget,
             "elapsed_time": elapsed_time,
-            "thoughts": "\n\n".join(thoughts) if thoughts else None,
-            "output": "\n\n".join(answer),
-            "usage_metadata": {
-                "prompt_tokens": response.usage_metadata.prompt_token_count if hasattr(response.usage_metadata, 'prompt_token_count') else None,
-                "candidates_tokens": response.usage_metadata.candidates_token_count if hasattr(response.usage_metadata, 'candidates_token_count') else None,
-                "total_tokens": response.usage_metadata.total_token_count if hasattr(response.usage_metadata, 'total_token_count') else None,
-                "thoughts_tokens": getattr(response.usage_metadata, 'thoughts_token_count', None)
-            }
+            "first_token_time": first_token_time,
+            "thoughts": thoughts_text,
+            "output": answer_text,
+            "usage_metadata": {key: usage.get(field) for key, field in _USAGE_FIELDS.items()}
         }
 
-        with open(result_file, 'w') as f:
-            json.dump(result_data, f, indent=2)
-
-        # Also save markdown version
-        md_file = results_dir / f"{test_case_name}_{timestamp}.md"
-        with open(md_file, 'w') as f:
-            f.write(f"# Test Case: {test_case_name}\n\n")
-            f.write(f"**Timestamp:** {timestamp}\n")
-            f.write(f"**Thinking Budget:** {thinking_budget}\n")
-            f.write(f"**Generation Time:** {elapsed_time:.2f}s\n\n")
+        result_file.write_text(json.dumps(result_data, indent=2))
 
-            if thoughts:
-                f.write("---\n\n## THINKING OUTPUT\n\n")
-                f.write("\n\n".join(thoughts))
-                f.write("\n\n---\n\n")
-
-            f.write("## SPECIFICATION OUTPUT\n\n")
-            f.write("\n\n".join(answer))
-
-        print(f"\n✓ Results saved to:")
-        print(f"  JSON: {result_file}")
-        print(f"  MD:   {md_file}")
+        print(f"\n{tag} ✓ Results saved to:")
+        print(f"{tag}   JSON: {result_file}")
+        print(f"{tag}   MD:   {md_file}")
 
         # Print summary
-        print(f"\n{'='*80}")
-        print("SUMMARY")
-        print(f"{'='*80}")
-        print(f"Output length: {len(''.join(answer))} characters")
-        print(f"Thoughts length: {len(''.join(thoughts))} characters" if thoughts else "Thoughts: Not captured")
+        print(f"\n{tag} SUMMARY")
+        print(f"{tag} Output length: {len(answer_text)} characters")
+        if thoughts_text:
+            print(f"{tag} Thoughts length: {len(thoughts_text)} characters")
+        else:
+            print(f"{tag} Thoughts: Not captured")
         if result_data['usage_metadata']['total_tokens']:
-            print(f"Total tokens: {result_data['usage_metadata']['total_tokens']}")
+            print(f"{tag} Total tokens: {result_data['usage_metadata']['total_tokens']}")
             if result_data['usage_metadata']['thoughts_tokens']:
-                print(f"Thinking tokens: {result_data['usage_metadata']['thoughts_tokens']}")
+                print(f"{tag} Thinking tokens: {result_data['usage_metadata']['thoughts_tokens']}")
 
         return result_data
 
     except Exception as e:
-        print(f"\n✗ ERROR: {str(e)}")
+        print(f"\n{tag} ✗ ERROR: {str(e)}")
         return None
 
 
+async def _create_template_cache(client):
+    """Upload the shared prompt template as a context cache; None if unavailable"""
+    try:
+        cache = await client.aio.caches.create(
+            model="gemini-3-pro-preview",
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=[types.Part(text=_PROMPT_TEMPLATE)])],
+                ttl="3600s"
+            )
+        )
+    except Exception as e:
+        print(f"Context cache unavailable, sending full prompts: {str(e)}")
+        return None
+
+    print(f"Prompt template cached as {cache.name}")
+    return cache
+
+
+async def _run_all(test_cases, thinking_budget=16384, save_thoughts=True, max_concurrency=None):
+    """Run test cases concurrently on one shared client; results keep input order"""
+    client = get_client()
+    semaphore = asyncio.Semaphore(max_concurrency or len(test_cases))
+
+    async def run_bounded(test_case, cached_content):
+        async with semaphore:
+            return await run_test_async(test_case, thinking_budget, save_thoughts, client,
+                                        cached_content=cached_content)
+
+    # The template is identical across cases, so send it once when running several
+    cache = await _create_template_cache(client) if len(test_cases) > 1 else None
+    try:
+        outcomes = await asyncio.gather(
+            *(
+                run_bounded(test_case, cache.name if cache else None)
+                for test_case in test_cases
+            ),
+            return_exceptions=True
+        )
+    finally:
+        if cache:
+            try:
+                await client.aio.caches.delete(name=cache.name)
+            except Exception as e:
+                print(f"Could not delete context cache {cache.name}: {str(e)}")
+
+    # run_test_async reports its own errors; treat anything escaping it as a failed run
+    return [None if isinstance(outcome, Exception) else outcome for outcome in outcomes]
+
+
 def evaluate_output(test_case_name, result_data):
     """Interactive evaluation helper"""
     print(f"\n{'='*80}")
@@ -257,17 +422,18 @@ def evaluate_output(test_case_name, result_data):
     total = 0
 
     for dimension, max_score in dimensions:
+        prompt = f"{dimension} (0-{max_score}): "
         while True:
-            try:
-                score = int(input(f"{dimension} (0-{max_score}): "))
-                if 0 <= score <= max_score:
-                    scores[dimension] = score
-                    total += score
-                    break
-                else:
-                    print(f"Please enter a score between 0 and {max_score}")
-            except ValueError:
+            match = _SCORE_RE.match(input(prompt))
+            if not match:
                 print("Please enter a valid number")
+                continue
+            score = int(match.group(1))
+            if score <= max_score:
+                scores[dimension] = score
+                total += score
+                break
+            print(f"Please enter a score between 0 and {max_score}")
 
     print(f"\n{'='*80}")
     print(f"TOTAL SCORE: {total}/50")
@@ -290,8 +456,7 @@ def evaluate_output(test_case_name, result_data):
     if notes:
         eval_data["notes"] = notes
 
-    with open(eval_file, 'w') as f:
-        json.dump(eval_data, f, indent=2)
+    eval_file.write_text(json.dumps(eval_data, indent=2))
 
     print(f"\n✓ Evaluation saved to: {eval_file}")
 
@@ -300,6 +465,19 @@ def evaluate_output(test_case_name, result_data):
 
 def main():
     """Main test runner"""
+    parser = argparse.ArgumentParser(description="Run slide deck prompt test cases against Gemini 2.5 Pro")
+    parser.add_argument("--cases", nargs="+", choices=list(TEST_CASES) + ["all"], default=["all"],
+                        help="Test cases to run (default: all)")
+    parser.add_argument("--thinking-budget", type=int, default=16384,
+                        help="Thinking token budget per run (default: 16384)")
+    parser.add_argument("--no-eval", action="store_true",
+                        help="Skip interactive evaluation prompts (for unattended runs)")
+    parser.add_argument("--parallel", type=int, default=None,
+                        help="Maximum concurrent runs (default: all selected cases at once)")
+    args = parser.parse_args()
+    if args.parallel is not None and args.parallel < 1:
+        parser.error("--parallel must be at least 1")
+
     print("""
 ╔═══════════════════════════════════════════════════════════════════════════╗
 ║                                                                           ║
@@ -308,36 +486,25 @@ def main():
 ╚═══════════════════════════════════════════════════════════════════════════╝
     """)
 
-    print("Available test cases:")
-    for i, (key, test) in enumerate(TEST_CASES.items(), 1):
-        print(f"  {i}. {key.capitalize():15} - {test['company']}")
-    print("  4. all            - Run all test cases")
-    print("  q. quit           - Exit\n")
-
-    choice = input("Select test case (1-4 or q): ").strip().lower()
-
-    if choice == 'q':
-        print("Exiting...")
-        return
-
-    # Determine which tests to run
-    if choice == '4' or choice == 'all':
-        test_cases_to_run = list(TEST_CASES.keys())
-    elif choice in ['1', '2', '3']:
-        test_cases_to_run = [list(TEST_CASES.keys())[int(choice) - 1]]
-    elif choice in TEST_CASES.keys():
-        test_cases_to_run = [choice]
+    # Determine which tests to run ("all" expands to every case, duplicates dropped)
+    if "all" in args.cases:
+        test_cases_to_run = list(TEST_CASES)
     else:
-        print("Invalid choice")
-        return
+        test_cases_to_run = list(dict.fromkeys(args.cases))
+
+    # Run tests concurrently (each is an independent, network-bound Gemini call)
+    outcomes = asyncio.run(_run_all(test_cases_to_run, thinking_budget=args.thinking_budget,
+                                    save_thoughts=True, max_concurrency=args.parallel))
 
-    # Run tests
+    # Evaluate interactively once all runs have finished
     results = []
-    for test_case in test_cases_to_run:
-        result = run_test(test_case, thinking_budget=16384, save_thoughts=True)
+    for test_case, result in zip(test_cases_to_run, outcomes):
         if result:
             results.append(result)
 
+            if args.no_eval:
+                continue
+
             # Ask if user wants to evaluate now
             evaluate_now = input(f"\nEvaluate {test_case} output now? (y/n): ").strip().lower()
             if evaluate_now == 'y':